@@ -0,0 +1,156 @@
+import io
+import csv
+import json
+import time
+import logging
+
+from aiogram import Router, F
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message, BufferedInputFile
+from aiogram.filters import Command, CommandObject
+from redis.exceptions import RedisError
+
+from bot.config import settings
+from bot.services.redis_client import RedisClient
+from bot.commands.forward import BANNED_SET, banned_key
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+CHUNK_SIZE = 5000
+PROGRESS_INTERVAL = 2  # секунды между обновлениями прогресса
+FIELDS = ("user_id", "username", "reason")
+
+
+# ——— Экспорт ————————————————————————————————————————————————————————
+async def iter_bans(redis):
+    """Отдаёт записи бан-листа пачками: SSCAN + HGETALL в одном pipeline."""
+    cursor = 0
+    seen: set[str] = set()  # SSCAN может вернуть один элемент несколько раз
+    while True:
+        cursor, ids = await redis.sscan(BANNED_SET, cursor=cursor, count=CHUNK_SIZE)
+        ids = [uid for uid in ids if uid not in seen]
+        seen.update(ids)
+        if ids:
+            pipe = redis.pipeline(transaction=False)
+            for uid in ids:
+                pipe.hgetall(banned_key(uid))
+            for uid, data in zip(ids, await pipe.execute()):
+                yield {"user_id": int(uid), "username": data.get("username", ""), "reason": data.get("reason", "")}
+        if cursor == 0:
+            break
+
+
+async def render_bans(redis, fmt: str) -> tuple[bytes, int]:
+    buf = io.StringIO()
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(buf, fieldnames=FIELDS)
+        writer.writeheader()
+        async for row in iter_bans(redis):
+            writer.writerow(row)
+            count += 1
+    else:
+        buf.write("[")
+        async for row in iter_bans(redis):
+            buf.write(("," if count else "") + "\n" + json.dumps(row, ensure_ascii=False))
+            count += 1
+        buf.write("\n]\n")
+    return buf.getvalue().encode("utf-8"), count
+
+
+@router.message(F.chat.id.in_(settings.admin_chats), Command("banexport"))
+async def cmd_banexport(message: Message, command: CommandObject):
+    redis = RedisClient.get_client()
+    fmt = (command.args or "csv").strip().lower()
+    if fmt not in ("csv", "json"):
+        return await message.reply("❗ Использование: /banexport [csv|json]")
+
+    data, count = await render_bans(redis, fmt)
+    filename = f"banlist_{time.strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    await message.reply_document(
+        BufferedInputFile(data, filename=filename),
+        caption=f"📋 Экспортировано записей: {count}",
+    )
+    logger.info("Exported %s bans as %s", count, fmt)
+
+
+# ——— Импорт ————————————————————————————————————————————————————————
+def parse_bans(raw: bytes, filename: str) -> tuple[list[dict], int]:
+    """
+    Возвращает корректные записи и число пропущенных строк.
+    Пустые username/reason остаются пустыми, чтобы экспорт → импорт ничего не менял.
+    """
+    text = raw.decode("utf-8-sig")
+    if filename.lower().endswith(".json") or text.lstrip().startswith("["):
+        rows = json.loads(text)
+        if not isinstance(rows, list):
+            raise ValueError("ожидался JSON-массив записей")
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    entries, skipped = [], 0
+    for row in rows:
+        uid = str(row.get("user_id", "")).strip() if isinstance(row, dict) else ""
+        if not uid.isdigit():
+            skipped += 1
+            continue
+        entries.append({
+            "user_id": int(uid),
+            "username": str(row.get("username") or ""),
+            "reason": str(row.get("reason") or ""),
+        })
+    return entries, skipped
+
+
+async def apply_bans(redis, entries: list[dict]):
+    """Пишет записи пачками SADD/HSET и после каждой отдаёт число применённых."""
+    for start in range(0, len(entries), CHUNK_SIZE):
+        chunk = entries[start:start + CHUNK_SIZE]
+        pipe = redis.pipeline(transaction=False)
+        pipe.sadd(BANNED_SET, *(e["user_id"] for e in chunk))
+        for e in chunk:
+            mapping = {k: e[k] for k in ("username", "reason") if e[k]}
+            if mapping:
+                pipe.hset(banned_key(e["user_id"]), mapping=mapping)
+        await pipe.execute()
+        yield start + len(chunk)
+
+
+@router.message(F.chat.id.in_(settings.admin_chats), Command("banimport"))
+async def cmd_banimport(message: Message):
+    document = message.document or (message.reply_to_message and message.reply_to_message.document)
+    if not document:
+        return await message.reply("❗ Отправьте CSV/JSON файл с подписью /banimport или ответьте командой на файл.")
+
+    try:
+        file = await message.bot.download(document)
+    except TelegramBadRequest as e:
+        return await message.reply(f"❌ Не удалось скачать файл: {e.message}")
+
+    try:
+        entries, skipped = parse_bans(file.read(), document.file_name or "")
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return await message.reply(f"❌ Не удалось разобрать файл: {e}")
+
+    redis = RedisClient.get_client()
+    total = len(entries)
+    status = await message.reply(f"⏳ Импорт: 0 / {total}")
+    last_update = time.monotonic()
+
+    done = 0
+    try:
+        async for done in apply_bans(redis, entries):
+            if done < total and time.monotonic() - last_update >= PROGRESS_INTERVAL:
+                await status.edit_text(f"⏳ Импорт: {done} / {total}")
+                last_update = time.monotonic()
+    except RedisError as e:
+        logger.exception("Ban import failed after %s of %s entries", done, total)
+        return await status.edit_text(f"❌ Ошибка Redis: применено {done} из {total} записей.\n{e}")
+
+    logger.info("Imported %s bans (%s skipped)", total, skipped)
+    await status.edit_text(f"✅ Импортировано: {total}, пропущено строк: {skipped}")
+
+
+def register_handlers(dp):
+    dp.include_router(router)
@@ -15,6 +15,10 @@ from aiogram.utils.markdown import hbold
 
 from bot.config import settings
 from bot.services.redis_client import RedisClient
+from bot.services.sharding import get_admin_chat
+from bot.services import faq
+from bot.services import stats
+from bot.services.stats import message_kind, track_ban, track_faq, track_message, track_reply
 from bot.states import ForwardStates
 
 
@@ -33,8 +37,21 @@ BANNED_SET = "banned_users"
 def banned_key(user_id: int) -> str:
     return f"ban:{user_id}"
 
-def reply_map_key(msg_id: int) -> str:
-    return f"reply_map:{msg_id}"
+def reply_map_key(msg_id: int, chat_id: int | None = None) -> str:
+    # id сообщений уникальны только внутри чата; для основного чата
+    # сохраняем прежний формат ключа, чтобы не потерять старые связи
+    if chat_id is None or chat_id == settings.admin_chat_id:
+        return f"reply_map:{msg_id}"
+    return f"reply_map:{chat_id}:{msg_id}"
+
+def forwarded_ref(chat_id: int, msg_id: int) -> str:
+    # значение reply_map для сообщения пользователя: куда и под каким id оно переслано
+    return f"{chat_id}:{msg_id}"
+
+def parse_forwarded_ref(value: str) -> tuple[int, int]:
+    # старые значения — только id сообщения в основном чате
+    chat_id, _, msg_id = value.rpartition(":")
+    return (int(chat_id) if chat_id else settings.admin_chat_id), int(msg_id)
 
 def rate_limit_key(user_id: int) -> str:
     return f"user_rate_limit:{user_id}"
@@ -47,7 +64,7 @@ async def is_banned(user_id: int) -> bool:
 
 
 # ——— Админ-хендлеры: бан / разбан / список —————————————————————————
-@router.message(F.chat.id == settings.admin_chat_id, F.reply_to_message, F.text.startswith("/ban"))
+@router.message(F.chat.id.in_(settings.admin_chats), F.reply_to_message, F.text.startswith("/ban"))
 async def admin_ban(message: Message):
     redis = RedisClient.get_client()
     reply = message.reply_to_message
@@ -55,7 +72,7 @@ async def admin_ban(message: Message):
     user_id = (
         reply.forward_from.id
         if reply.forward_from
-        else int(await redis.get(reply_map_key(reply.message_id)) or 0)
+        else int(await redis.get(reply_map_key(reply.message_id, message.chat.id)) or 0)
     )
     if not user_id:
         return await message.reply("❗ Не удалось определить пользователя для бана.")
@@ -67,15 +84,18 @@ async def admin_ban(message: Message):
         else str(user_id)
     )
 
-    await message.bot.ban_chat_member(settings.admin_chat_id, user_id)
-    await redis.sadd(BANNED_SET, user_id)
-    await redis.hset(banned_key(user_id), mapping={"username": username, "reason": reason})
+    await message.bot.ban_chat_member(message.chat.id, user_id)
+    pipe = redis.pipeline(transaction=False)
+    pipe.sadd(BANNED_SET, user_id)
+    pipe.hset(banned_key(user_id), mapping={"username": username, "reason": reason})
+    track_ban(pipe)
+    await pipe.execute()
 
     logger.info("Banned user: %s (%s)", username, user_id)
     await message.reply(f"✅ Забанен {username} (<code>{user_id}</code>)\nПричина: <i>{reason}</i>", parse_mode="HTML")
 
 
-@router.message(F.chat.id == settings.admin_chat_id, F.reply_to_message, F.text.startswith("/unban"))
+@router.message(F.chat.id.in_(settings.admin_chats), F.reply_to_message, F.text.startswith("/unban"))
 async def admin_unban(message: Message):
     redis = RedisClient.get_client()
     reply = message.reply_to_message
@@ -83,12 +103,12 @@ async def admin_unban(message: Message):
     user_id = (
         reply.forward_from.id
         if reply.forward_from
-        else int(await redis.get(reply_map_key(reply.message_id)) or 0)
+        else int(await redis.get(reply_map_key(reply.message_id, message.chat.id)) or 0)
     )
     if not user_id:
         return await message.reply("❗ Не удалось определить пользователя.")
 
-    await message.bot.unban_chat_member(settings.admin_chat_id, user_id)
+    await message.bot.unban_chat_member(message.chat.id, user_id)
     await redis.srem(BANNED_SET, user_id)
     await redis.delete(banned_key(user_id))
 
@@ -96,7 +116,7 @@ async def admin_unban(message: Message):
     await message.reply(f"✅ Разбанен <code>{user_id}</code>", parse_mode="HTML")
 
 
-@router.message(F.chat.id == settings.admin_chat_id, Command("unban"))
+@router.message(F.chat.id.in_(settings.admin_chats), Command("unban"))
 async def admin_unban_by_id(message: Message, command: CommandObject):
     redis = RedisClient.get_client()
     args = (command.args or "").strip()
@@ -114,7 +134,7 @@ async def admin_unban_by_id(message: Message, command: CommandObject):
     await message.reply(f"✅ Пользователь <code>{user_id}</code> разбанен.", parse_mode="HTML")
 
 
-@router.message(F.chat.id == settings.admin_chat_id, Command("banlist"))
+@router.message(F.chat.id.in_(settings.admin_chats), Command("banlist"))
 async def cmd_banlist(message: Message):
     redis = RedisClient.get_client()
     banned = await redis.smembers(BANNED_SET)
@@ -133,7 +153,7 @@ async def cmd_banlist(message: Message):
 
 
 # ——— Пересылка сообщений от пользователей ——————————————————————————
-@router.message((F.text | F.caption | F.photo | F.document | F.video | F.sticker) & (F.chat.id != settings.admin_chat_id))
+@router.message((F.text | F.caption | F.photo | F.document | F.video | F.sticker) & (~F.chat.id.in_(settings.admin_chats)))
 async def forward_user_message(message: Message):
     redis = RedisClient.get_client()
     user_id = message.from_user.id
@@ -142,29 +162,50 @@ async def forward_user_message(message: Message):
         return
 
     reply_to = message.reply_to_message
+
+    # автоответ только на обычный текст; медиа и ответы в диалоге всегда идут админам
+    faq_candidate = bool(message.text) and not reply_to
+    if faq_candidate:
+        answer = faq.match(message.text)
+        if answer:
+            await message.answer(answer)
+            pipe = redis.pipeline(transaction=False)
+            track_message(pipe, user_id, message_kind(message))
+            track_faq(pipe, answered=True)
+            await stats.execute(pipe)
+            return
+
+    admin_chat_id = await get_admin_chat(user_id)
+
     reply_to_forwarded_id = None
     if reply_to:
         redis_val = await redis.get(reply_map_key(reply_to.message_id))
         if redis_val:
-            reply_to_forwarded_id = int(redis_val)
-
-    if message.sticker:
-        forwarded_msg = await message.forward(chat_id=settings.admin_chat_id, reply_to_message_id=reply_to_forwarded_id)
-        await redis.set(reply_map_key(message.message_id), forwarded_msg.message_id)
-        await redis.set(reply_map_key(forwarded_msg.message_id), user_id)
-        return
+            # после смены закреплённого чата старый id там не существует
+            fwd_chat_id, fwd_msg_id = parse_forwarded_ref(redis_val)
+            if fwd_chat_id == admin_chat_id:
+                reply_to_forwarded_id = fwd_msg_id
 
     if message.media_group_id:
-        await handle_media_group(message, reply_to_forwarded_id)
+        await handle_media_group(message, reply_to_forwarded_id, admin_chat_id)
         return
 
-    forwarded_msg = await message.forward(chat_id=settings.admin_chat_id, reply_to_message_id=reply_to_forwarded_id)
-    await redis.set(reply_map_key(message.message_id), forwarded_msg.message_id)
-    await redis.set(reply_map_key(forwarded_msg.message_id), user_id)
+    forwarded_msg = await message.forward(
+        chat_id=admin_chat_id, reply_to_message_id=reply_to_forwarded_id, allow_sending_without_reply=True
+    )
+
+    # связи и счётчики статистики уходят в Redis одним запросом
+    pipe = redis.pipeline(transaction=False)
+    pipe.set(reply_map_key(message.message_id), forwarded_ref(admin_chat_id, forwarded_msg.message_id))
+    pipe.set(reply_map_key(forwarded_msg.message_id, admin_chat_id), user_id)
+    track_message(pipe, user_id, message_kind(message))
+    if faq_candidate:
+        track_faq(pipe, answered=False)
+    await stats.execute(pipe)
     logger.info("Forwarded message %s → %s", message.message_id, forwarded_msg.message_id)
 
 
-async def handle_media_group(message: Message, reply_to_forwarded_id: int):
+async def handle_media_group(message: Message, reply_to_forwarded_id: int, admin_chat_id: int):
     redis = RedisClient.get_client()
     media_group_id = message.media_group_id
     buffer = _album_buffer.setdefault(media_group_id, [])
@@ -178,9 +219,13 @@ async def handle_media_group(message: Message, reply_to_forwarded_id: int):
             return
 
         first = group[0]
-        first_fwd = await first.forward(chat_id=settings.admin_chat_id, reply_to_message_id=reply_to_forwarded_id)
-        await redis.set(reply_map_key(first.message_id), first_fwd.message_id)
-        await redis.set(reply_map_key(first_fwd.message_id), first.from_user.id)
+        first_fwd = await first.forward(
+            chat_id=admin_chat_id, reply_to_message_id=reply_to_forwarded_id, allow_sending_without_reply=True
+        )
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(reply_map_key(first.message_id), forwarded_ref(admin_chat_id, first_fwd.message_id))
+        pipe.set(reply_map_key(first_fwd.message_id, admin_chat_id), first.from_user.id)
+        track_message(pipe, first.from_user.id, "album")
 
         media = []
         msg_map = []
@@ -195,21 +240,34 @@ async def handle_media_group(message: Message, reply_to_forwarded_id: int):
             msg_map.append(msg)
 
         if media:
-            sent = await message.bot.send_media_group(chat_id=settings.admin_chat_id, media=media, reply_to_message_id=first_fwd.message_id)
+            sent = await message.bot.send_media_group(
+                chat_id=admin_chat_id, media=media,
+                reply_to_message_id=first_fwd.message_id, allow_sending_without_reply=True,
+            )
             for orig, sent_msg in zip(msg_map, sent):
-                await redis.set(reply_map_key(orig.message_id), sent_msg.message_id)
-                await redis.set(reply_map_key(sent_msg.message_id), orig.from_user.id)
+                pipe.set(reply_map_key(orig.message_id), forwarded_ref(admin_chat_id, sent_msg.message_id))
+                pipe.set(reply_map_key(sent_msg.message_id, admin_chat_id), orig.from_user.id)
+
+        await stats.execute(pipe)
+
+
+def drain_album_buffer() -> list[Message]:
+    """Забирает ещё не отправленные части альбомов (при остановке бота)."""
+    messages = [msg for group in _album_buffer.values() for msg in group]
+    _album_buffer.clear()
+    return messages
 
 
 # ——— Ответ администратора пользователю ————————————————————————————
-@router.message(F.chat.id == settings.admin_chat_id, F.reply_to_message)
+# команды в ответ на сообщение (/stats, /help…) не отправляются пользователю
+@router.message(F.chat.id.in_(settings.admin_chats), F.reply_to_message, ~F.text.startswith("/"))
 async def admin_reply(message: Message):
     redis = RedisClient.get_client()
     reply = message.reply_to_message
 
     user_id = reply.forward_from.id if reply.forward_from else None
     if not user_id:
-        redis_id = await redis.get(reply_map_key(reply.message_id))
+        redis_id = await redis.get(reply_map_key(reply.message_id, message.chat.id))
         user_id = int(redis_id) if redis_id else None
     if not user_id:
         return
@@ -226,10 +284,12 @@ async def admin_reply(message: Message):
         elif message.document:
             await message.bot.send_document(user_id, message.document.file_id, caption=message.caption)
         else:
-            await message.reply("❗ Тип контента не поддерживается.")
+            return await message.reply("❗ Тип контента не поддерживается.")
     except Exception as e:
         logger.exception("Ошибка при отправке ответа")
-        await message.reply(f"❌ Не удалось отправить сообщение: {e}")
+        return await message.reply(f"❌ Не удалось отправить сообщение: {e}")
+
+    track_reply((message.date - reply.date).total_seconds())
 
 
 # ——— Команды /forward и кнопка пересылки ——————————————————————————
@@ -271,8 +331,9 @@ async def do_forward(message: Message, text: str):
     await redis.set(key, now, ex=RATE_LIMIT_TTL)
     await redis.lpush(f"user:{message.from_user.id}:forwards", text)
 
-    forwarded = await message.forward(settings.admin_chat_id)
-    await redis.set(reply_map_key(forwarded.message_id), message.from_user.id)
+    admin_chat_id = await get_admin_chat(message.from_user.id)
+    forwarded = await message.forward(admin_chat_id)
+    await redis.set(reply_map_key(forwarded.message_id, admin_chat_id), message.from_user.id)
 
 
 def register_handlers(dp):
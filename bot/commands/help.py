@@ -20,7 +20,11 @@ async def cmd_help(message: Message):
         "  • Ответ на пересланное сообщение командой <code>/unban</code>\n"
         "    — снять бан с пользователя\n"
         "  • <code>/unban &lt;user_id&gt;</code> — разбанить по ID без reply\n"
-        "  • <code>/banlist</code> — показать список забаненных\n\n"
+        "  • <code>/banlist</code> — показать список забаненных\n"
+        "  • <code>/banexport [csv|json]</code> — выгрузить бан-лист файлом\n"
+        "  • <code>/banimport</code> — подпись к CSV/JSON файлу или ответ на него;\n"
+        "    колонки <code>user_id, username, reason</code>\n"
+        "  • <code>/stats</code> — статистика за день и месяц\n\n"
         "🤖 Примеры:\n"
         "  /ban Спам в чате\n"
         "  /unban 123456789\n\n"
@@ -0,0 +1,50 @@
+from aiogram import Router, F
+from aiogram.types import Message
+from aiogram.filters import Command
+
+from bot.config import settings
+from bot.services.redis_client import RedisClient
+from bot.services.stats import read_stats
+
+import logging
+logger = logging.getLogger(__name__)
+
+router = Router()
+
+_KIND_NAMES = {
+    "text": "Текст",
+    "photo": "Фото",
+    "album": "Альбомы",
+    "sticker": "Стикеры",
+    "video": "Видео",
+    "document": "Документы",
+}
+
+@router.message(F.chat.id.in_(settings.admin_chats), Command("stats"))
+async def cmd_stats(message: Message):
+    stats = await read_stats(RedisClient.get_client())
+
+    lines = [
+        "📊 <b>Статистика за сегодня</b>\n",
+        f"👤 Уникальных пользователей: {stats['users_day']} (за месяц: {stats['users_month']})",
+    ]
+    if stats["messages"]:
+        lines.append("✉️ Сообщений:")
+        for kind, count in sorted(stats["messages"].items(), key=lambda kv: -kv[1]):
+            lines.append(f"  • {_KIND_NAMES.get(kind, kind)}: {count}")
+    else:
+        lines.append("✉️ Сообщений: 0")
+
+    latency = stats["reply_latency"]
+    latency_text = f"{latency / 60:.1f} мин" if latency is not None else "—"
+    lines.append(f"💬 Ответов админов: {stats['replies']}, среднее время ответа: {latency_text}")
+    lines.append(f"🚫 Банов: {stats['bans']}")
+
+    rate = stats["faq_rate"]
+    rate_text = f"{rate:.0%}" if rate is not None else "—"
+    lines.append(f"🤖 Автоответов FAQ: {stats['faq_answered']}, доля без пересылки: {rate_text}")
+
+    await message.reply("\n".join(lines), parse_mode="HTML")
+
+def register_handlers(dp):
+    dp.include_router(router)
@@ -3,12 +3,25 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     bot_token: str
     admin_chat_id: int
+    admin_chat_ids: list[int] = []  # дополнительные админ-чаты, JSON: [-100..., -100...]
     redis_url: str = 'redis://localhost:6379/0'
     start_message: str
-    
+    max_concurrent_updates: int = 50
+    user_queue_limit: int = 1000
+    user_queue_timeout: float = 30.0
+    shutdown_timeout: float = 20.0
+    leader_lock_ttl: float = 15.0
+    faq_path: str = ''  # пусто — автоответы выключены, пример: faq.example.json
+    faq_human_phrases: list[str] = ['оператор', 'админ', 'человек', 'поддержк', 'operator', 'human']
+
     model_config = {
         'env_file': '.env',
         'case_sensitive': False,
     }
 
+    @property
+    def admin_chats(self) -> list[int]:
+        # основной чат всегда первый, дубликаты отбрасываем
+        return list(dict.fromkeys([self.admin_chat_id, *self.admin_chat_ids]))
+
 settings = Settings()
\ No newline at end of file
@@ -1,44 +1,48 @@
 import os
 import asyncio
+from contextlib import suppress
 import pkgutil
 import importlib
 from datetime import datetime
 from aiogram import Bot, Dispatcher
+from aiogram.types import Update
 from aiogram.fsm.storage.redis import RedisStorage
 import logging
 from logging.handlers import RotatingFileHandler
 
 from bot.config import settings
+from bot.services.scheduler import UpdateScheduler
+from bot.services.lifecycle import LeaderLock, save_pending, pop_pending
+from bot.services import faq, stats
+from bot.services.redis_client import RedisClient
+
+logger = logging.getLogger()
 
 # === ЛОГИРОВАНИЕ ===
-log_dir = os.path.join(os.getcwd(), "logs", datetime.now().strftime("%Y%m%d_%H%M%S"))
-os.makedirs(log_dir, exist_ok=True)
+def setup_logging():
+    log_dir = os.path.join(os.getcwd(), "logs", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(log_dir, exist_ok=True)
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-fmt = logging.Formatter('%(asctime)s %(levelname)-8s [%(name)s:%(lineno)d] %(message)s')
-
-# Консоль
-sh = logging.StreamHandler()
-sh.setFormatter(fmt)
-logger.addHandler(sh)
-
-# Файл с ротацией
-fh = RotatingFileHandler(os.path.join(log_dir, "bot.log"),
-                         maxBytes=5*1024*1024, backupCount=5, encoding='utf-8')
-fh.setFormatter(fmt)
-logger.addHandler(fh)
-# ==================
+    logger.setLevel(logging.INFO)
+    fmt = logging.Formatter('%(asctime)s %(levelname)-8s [%(name)s:%(lineno)d] %(message)s')
 
-async def main():
-    bot = Bot(token=settings.bot_token)
-    storage = RedisStorage.from_url(settings.redis_url)
-    dp = Dispatcher(storage=storage)
+    # Консоль
+    sh = logging.StreamHandler()
+    sh.setFormatter(fmt)
+    logger.addHandler(sh)
 
+    # Файл с ротацией
+    fh = RotatingFileHandler(os.path.join(log_dir, "bot.log"),
+                             maxBytes=5*1024*1024, backupCount=5, encoding='utf-8')
+    fh.setFormatter(fmt)
+    logger.addHandler(fh)
+# ==================
 
+def register_commands(dp: Dispatcher):
     from bot import commands
 
-    module_names = [name for _, name, _ in pkgutil.iter_modules(commands.__path__)]
+    # только валидные имена модулей: резервные копии вида "forward (copy).py" не грузим
+    module_names = [name for _, name, _ in pkgutil.iter_modules(commands.__path__) if name.isidentifier()]
 
     module_names = sorted(module_names, key=lambda n: (n != "start", n))
 
@@ -48,9 +52,76 @@ async def main():
         if hasattr(module, 'register_handlers'):
             module.register_handlers(dp)
 
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+async def main():
+    bot = Bot(token=settings.bot_token)
+    storage = RedisStorage.from_url(settings.redis_url)
+    dp = Dispatcher(storage=storage)
+
+    scheduler = UpdateScheduler(
+        max_in_flight=settings.max_concurrent_updates,
+        user_queue_limit=settings.user_queue_limit,
+        user_max_wait=settings.user_queue_timeout,
+    )
+    dp.update.outer_middleware(scheduler)
+
+    register_commands(dp)
+
+    lock = LeaderLock(ttl=settings.leader_lock_ttl)
+
+    @dp.shutdown()
+    async def on_shutdown():
+        # polling уже остановлен: дожидаемся начатых апдейтов и альбомов
+        leftovers = await scheduler.drain(settings.shutdown_timeout)
+        await stats.flush_replies(RedisClient.get_client())
+
+        if lock.lost:
+            # апдейты и getUpdates теперь принадлежат другому экземпляру
+            logger.warning("Leadership lost: skipping persist of %s updates and offset ack", len(leftovers))
+            return
+
+        from bot.commands.forward import drain_album_buffer
+        leftovers += [Update(update_id=0, message=msg) for msg in drain_album_buffer()]
+        await save_pending(leftovers)
+
+        # подтверждаем полученные апдейты, чтобы следующий экземпляр их не повторил
+        if scheduler.last_update_id:
+            await bot.get_updates(offset=scheduler.last_update_id + 1, limit=1, timeout=0)
+
+    async def on_lock_lost():
+        # до старта polling останавливать нечего — main() проверит lock.lost сам
+        with suppress(RuntimeError):
+            await dp.stop_polling()
+
+    await lock.acquire()
+    lock_task = asyncio.create_task(lock.keep_alive(on_lost=on_lock_lost))
+    report_task = asyncio.create_task(scheduler.report())
+
+    faq.load_faq()
+    faq_task = asyncio.create_task(faq.listen_reload())
+
+    try:
+        pending = await pop_pending(bot)
+        if pending:
+            logger.info("Replaying %s unfinished updates", len(pending))
+            results = await asyncio.gather(*(dp.feed_update(bot, u) for u in pending), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Failed to replay update: %r", result)
+
+        # необработанные апдейты остаются у Telegram для этого экземпляра
+        await bot.delete_webhook(drop_pending_updates=False)
+        if lock.lost:
+            logger.error("Leader lock lost before polling started, exiting")
+            await bot.session.close()
+            return
+        await dp.start_polling(bot)
+    finally:
+        report_task.cancel()
+        faq_task.cancel()
+        lock_task.cancel()
+        await lock.release()
 
 if __name__ == '__main__':
+    setup_logging()
     logger.info("Start Bot: %s", datetime.today())
     asyncio.run(main())
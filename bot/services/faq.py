@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import re
+from collections import Counter, deque
+
+from bot.config import settings
+from bot.services.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHANNEL = "faq:reload"
+RECONNECT_DELAY = (1, 60)  # секунды: начальная и максимальная пауза
+HUMAN = -1  # значение шаблона «позовите человека»
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    words = _NON_WORD.sub(" ", text.lower().replace("ё", "е")).split()
+    return f" {' '.join(words)} "
+
+
+class Automaton:
+    """Aho-Corasick: все ключевые фразы находятся за один проход по тексту."""
+
+    def __init__(self, patterns: dict[str, int]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(value)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> list[int]:
+        found = []
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            found += self._out[node]
+        return found
+
+
+class FaqMatcher:
+    def __init__(self, entries: list[dict], human_phrases: list[str]):
+        self.answers = [e["answer"] for e in entries]
+        # ведущий пробел — фраза совпадает только с начала слова, а хвост
+        # свободен, чтобы «оператор» находился и в «оператора»
+        patterns: dict[str, int] = {}
+        phrases = [(p, idx) for idx, e in enumerate(entries) for p in e["keywords"]]
+        phrases += [(p, HUMAN) for p in human_phrases]
+        for phrase, value in phrases:
+            pattern = normalize(phrase).rstrip()
+            # пустой шаблон совпал бы с любым текстом
+            if not pattern.strip():
+                logger.warning("Skipping FAQ phrase without words: %r", phrase)
+                continue
+            patterns[pattern] = value
+        self._automaton = Automaton(patterns)
+
+    def match(self, text: str) -> str | None:
+        """Ответ на вопрос или None, если нужно переслать админам."""
+        hits = self._automaton.find(normalize(text))
+        if not hits or HUMAN in hits:
+            return None
+        idx, _ = Counter(hits).most_common(1)[0]
+        return self.answers[idx]
+
+
+_matcher: FaqMatcher | None = None
+
+
+def load_faq(raw: str | None = None):
+    """Строит автомат из файла settings.faq_path или из переданного JSON."""
+    global _matcher
+    if raw is None and not settings.faq_path:
+        logger.info("FAQ_PATH is not set, auto-answers disabled")
+        return
+    try:
+        if raw is None:
+            with open(settings.faq_path, encoding="utf-8") as f:
+                raw = f.read()
+        entries = json.loads(raw)
+        _matcher = FaqMatcher(entries, settings.faq_human_phrases)
+    except (OSError, ValueError, KeyError, TypeError):
+        # нет файла или битый FAQ — оставляем предыдущий автомат
+        logger.exception("Failed to load FAQ, keeping the previous one")
+    else:
+        logger.info("FAQ loaded: %s entries", len(entries))
+
+
+def match(text: str) -> str | None:
+    return _matcher.match(text) if _matcher else None
+
+
+async def listen_reload():
+    """
+    Перезагрузка FAQ без рестарта: PUBLISH faq:reload '<json>'
+    или PUBLISH faq:reload '' — перечитать файл.
+    """
+    delay = RECONNECT_DELAY[0]
+    while True:
+        pubsub = RedisClient.get_client().pubsub()
+        try:
+            await pubsub.subscribe(RELOAD_CHANNEL)
+            delay = RECONNECT_DELAY[0]
+            async for msg in pubsub.listen():
+                if msg["type"] == "message":
+                    load_faq(msg["data"] or None)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("FAQ reload listener failed, resubscribing in %ss", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY[1])
+        finally:
+            await pubsub.reset()
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+import uuid
+
+from redis.exceptions import RedisError
+
+from aiogram import Bot
+from aiogram.types import Update
+
+from bot.services.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "bot:leader"
+PENDING_UPDATES = "bot:pending_updates"
+
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderLock:
+    """
+    Только держатель блокировки опрашивает Telegram.
+    Новый экземпляр при деплое ждёт, пока старый допишет и отпустит ключ.
+    """
+
+    def __init__(self, ttl: float, retry_interval: float = 0.5):
+        self.ttl_ms = int(ttl * 1000)
+        self.retry_interval = retry_interval
+        self.token = uuid.uuid4().hex
+        self.lost = False
+
+    async def acquire(self):
+        redis = RedisClient.get_client()
+        waiting = False
+        while not await redis.set(LEADER_KEY, self.token, nx=True, px=self.ttl_ms):
+            if not waiting:
+                logger.info("Waiting for leader lock held by another instance")
+                waiting = True
+            await asyncio.sleep(self.retry_interval)
+        logger.info("Leader lock acquired: %s", self.token)
+
+    async def keep_alive(self, on_lost):
+        redis = RedisClient.get_client()
+        interval = self.ttl_ms / 3000
+        last_renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await redis.eval(_RENEW_SCRIPT, 1, LEADER_KEY, self.token, self.ttl_ms)
+            except RedisError:
+                # следующая попытка будет уже после истечения ключа — считаем его потерянным
+                expired = time.monotonic() - last_renewed + interval >= self.ttl_ms / 1000
+                logger.warning("Leader lock renewal failed%s", ", giving up" if expired else ", retrying", exc_info=True)
+                if not expired:
+                    continue
+                renewed = False
+
+            if not renewed:
+                logger.error("Leader lock lost, stopping polling")
+                self.lost = True
+                await on_lost()
+                return
+            last_renewed = time.monotonic()
+
+    async def release(self):
+        redis = RedisClient.get_client()
+        await redis.eval(_RELEASE_SCRIPT, 1, LEADER_KEY, self.token)
+        logger.info("Leader lock released: %s", self.token)
+
+
+# ——— Незавершённые апдейты ————————————————————————————————————————
+async def save_pending(updates: list[Update]):
+    if not updates:
+        return
+    redis = RedisClient.get_client()
+    await redis.rpush(PENDING_UPDATES, *(u.model_dump_json(exclude_none=True) for u in updates))
+    logger.warning("Persisted %s unfinished updates", len(updates))
+
+
+async def pop_pending(bot: Bot) -> list[Update]:
+    redis = RedisClient.get_client()
+    pipe = redis.pipeline(transaction=True)
+    pipe.lrange(PENDING_UPDATES, 0, -1)
+    pipe.delete(PENDING_UPDATES)
+    raw, _ = await pipe.execute()
+    return [Update.model_validate_json(item, context={"bot": bot}) for item in raw]
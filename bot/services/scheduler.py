@@ -0,0 +1,187 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_ADMIN = 0
+PRIORITY_USER = 1
+_PRIORITY_NAMES = {PRIORITY_ADMIN: "admin", PRIORITY_USER: "user"}
+
+
+class _WaitStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.shed = 0
+
+    def observe(self, waited: float):
+        self.count += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+    def snapshot(self) -> dict:
+        avg = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "avg": avg, "max": self.max, "shed": self.shed}
+
+
+class UpdateScheduler(BaseMiddleware):
+    """
+    Ограничивает число одновременно обрабатываемых апдейтов.
+    Апдейты из админ-чатов получают освободившийся слот первыми,
+    пользовательские при перегрузке ждут в очереди или отбрасываются.
+    """
+
+    def __init__(self, max_in_flight: int, user_queue_limit: int, user_max_wait: float):
+        self.max_in_flight = max_in_flight
+        self.user_queue_limit = user_queue_limit
+        self.user_max_wait = user_max_wait
+        self._admin_chats = frozenset(settings.admin_chats)
+
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future, TelegramObject]] = []
+        self._queued = {PRIORITY_ADMIN: 0, PRIORITY_USER: 0}
+        self._seq = itertools.count()
+        self.stats = {p: _WaitStats() for p in _PRIORITY_NAMES}
+
+        # принятые, но ещё не обработанные апдейты — для остановки без потерь
+        self._active: dict[int, Update] = {}
+        self._closed = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.last_update_id = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        chat = data.get("event_chat")
+        priority = PRIORITY_ADMIN if chat and chat.id in self._admin_chats else PRIORITY_USER
+
+        self._track(event)
+        try:
+            started = time.monotonic()
+            if not await self._acquire(priority, event):
+                if self._closed:
+                    return None  # сохранён в drain() для следующего экземпляра
+                self.stats[priority].shed += 1
+                logger.warning("Shed %s update %s", _PRIORITY_NAMES[priority], getattr(event, "update_id", None))
+                return None
+            self.stats[priority].observe(time.monotonic() - started)
+
+            try:
+                return await handler(event, data)
+            finally:
+                self._release()
+        finally:
+            self._untrack(event)
+
+    def _track(self, event: TelegramObject):
+        self._active[id(event)] = event
+        self._idle.clear()
+        self.last_update_id = max(self.last_update_id, getattr(event, "update_id", 0))
+
+    def _untrack(self, event: TelegramObject):
+        self._active.pop(id(event), None)
+        if not self._active:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> list[Update]:
+        """
+        Ждёт завершения принятых апдейтов. По таймауту закрывает очередь и
+        возвращает только те, что так и не начали обрабатываться: уже запущенные
+        повторять нельзя, иначе пересылка может уйти в админ-чат дважды.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return []
+        except asyncio.TimeoutError:
+            return self._close()
+
+    def _close(self) -> list[Update]:
+        self._closed = True
+        # только ожидающие без выданного слота: получивший слот, но ещё
+        # не возобновившийся апдейт уже считается запущенным
+        pending = []
+        while self._waiters:
+            _, _, fut, event = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(False)
+                pending.append(event)
+
+        running = len(self._active) - len(pending)
+        if running:
+            logger.warning("%s updates still running after shutdown timeout, not persisted", running)
+        return pending
+
+    async def _acquire(self, priority: int, event: TelegramObject) -> bool:
+        if self._closed:
+            return False
+
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return True
+
+        if priority == PRIORITY_USER and self._queued[PRIORITY_USER] >= self.user_queue_limit:
+            return False
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut, event))
+        self._queued[priority] += 1
+        timeout = self.user_max_wait if priority == PRIORITY_USER else None
+
+        # результат future: True — слот передан, False — очередь закрыта
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            # слот мог быть передан в последний момент
+            if fut.done():
+                return fut.result()
+            fut.cancel()
+            return False
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.result():
+                self._release()
+            else:
+                fut.cancel()
+            raise
+        finally:
+            self._queued[priority] -= 1
+
+    def _release(self):
+        # слот передаётся первому живому ожидающему без уменьшения счётчика
+        while self._waiters:
+            _, _, fut, _ = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(True)
+                return
+        self._in_flight -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": {_PRIORITY_NAMES[p]: n for p, n in self._queued.items()},
+            "wait": {_PRIORITY_NAMES[p]: s.snapshot() for p, s in self.stats.items()},
+        }
+
+    async def report(self, interval: float = 60.0):
+        while True:
+            await asyncio.sleep(interval)
+            snap = self.snapshot()
+            # ожидание считаем по окнам, иначе среднее за всё время скрывает текущую перегрузку
+            self.stats = {p: _WaitStats() for p in _PRIORITY_NAMES}
+            logger.info(
+                "Scheduler (last %ss): in_flight=%s queued=%s wait=%s",
+                int(interval), snap["in_flight"], snap["queued"], snap["wait"],
+            )
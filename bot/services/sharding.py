@@ -0,0 +1,45 @@
+import bisect
+import hashlib
+
+from bot.config import settings
+from bot.services.redis_client import RedisClient
+
+ASSIGNMENT_HASH = "user_admin_chat"
+VIRTUAL_NODES = 100
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Консистентное хеширование пользователей по админ-чатам."""
+
+    def __init__(self, nodes: list[int], replicas: int = VIRTUAL_NODES):
+        self._ring: list[tuple[int, int]] = sorted(
+            (_hash(f"{node}:{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._keys = [h for h, _ in self._ring]
+
+    def get_node(self, key: int | str) -> int:
+        idx = bisect.bisect(self._keys, _hash(str(key))) % len(self._keys)
+        return self._ring[idx][1]
+
+
+_ring = HashRing(settings.admin_chats)
+
+
+async def get_admin_chat(user_id: int) -> int:
+    """Админ-чат пользователя: закреплённый в Redis или выбранный по кольцу."""
+    chats = settings.admin_chats
+    if len(chats) == 1:
+        return chats[0]
+
+    redis = RedisClient.get_client()
+    stored = await redis.hget(ASSIGNMENT_HASH, user_id)
+    if stored and int(stored) in chats:
+        return int(stored)
+
+    chat_id = _ring.get_node(user_id)
+    await redis.hset(ASSIGNMENT_HASH, user_id, chat_id)
+    return chat_id
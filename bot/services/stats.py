@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+from aiogram.types import Message
+
+DAY_TTL = 40 * 24 * 3600
+MONTH_TTL = 400 * 24 * 3600
+
+# ответы админов копятся в памяти и уходят с ближайшим pipeline пересылки или /stats
+_pending_replies = {"count": 0, "total": 0.0}
+
+
+# ——— Redis ключи ————————————————————————————————————————————————
+def _day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+def _month() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m")
+
+def users_day_key(day: str) -> str:
+    return f"stats:users:day:{day}"
+
+def users_month_key(month: str) -> str:
+    return f"stats:users:month:{month}"
+
+def messages_key(day: str) -> str:
+    return f"stats:messages:{day}"
+
+def replies_key(day: str) -> str:
+    return f"stats:replies:{day}"
+
+def bans_key(day: str) -> str:
+    return f"stats:bans:{day}"
+
+def faq_key(day: str) -> str:
+    return f"stats:faq:{day}"
+
+
+# ——— Запись: команды добавляются в чужой pipeline ————————————————————
+def message_kind(message: Message) -> str:
+    if message.sticker:
+        return "sticker"
+    if message.media_group_id:
+        return "album"
+    if message.photo:
+        return "photo"
+    if message.video:
+        return "video"
+    if message.document:
+        return "document"
+    return "text"
+
+
+def track_message(pipe, user_id: int, kind: str):
+    day, month = _day(), _month()
+    pipe.pfadd(users_day_key(day), user_id)
+    pipe.expire(users_day_key(day), DAY_TTL)
+    pipe.pfadd(users_month_key(month), user_id)
+    pipe.expire(users_month_key(month), MONTH_TTL)
+    pipe.hincrby(messages_key(day), kind, 1)
+    pipe.expire(messages_key(day), DAY_TTL)
+
+
+def track_reply(latency: float):
+    _pending_replies["count"] += 1
+    _pending_replies["total"] += latency
+
+
+def _take_replies(pipe) -> tuple[int, float]:
+    # забираем буфер сразу, чтобы параллельный pipeline не записал его второй раз
+    count, total = _pending_replies["count"], _pending_replies["total"]
+    if count:
+        day = _day()
+        pipe.hincrby(replies_key(day), "count", count)
+        pipe.hincrbyfloat(replies_key(day), "total", total)
+        pipe.expire(replies_key(day), DAY_TTL)
+        _pending_replies.update(count=0, total=0.0)
+    return count, total
+
+
+def _restore_replies(taken: tuple[int, float]):
+    _pending_replies["count"] += taken[0]
+    _pending_replies["total"] += taken[1]
+
+
+async def execute(pipe) -> list:
+    """pipe.execute() с досылкой накопленных ответов; при ошибке они возвращаются в буфер."""
+    taken = _take_replies(pipe)
+    try:
+        return await pipe.execute()
+    except Exception:
+        _restore_replies(taken)
+        raise
+
+
+async def flush_replies(redis):
+    """Досылает накопленные ответы админов (при остановке бота)."""
+    if _pending_replies["count"]:
+        await execute(redis.pipeline(transaction=False))
+
+
+def track_ban(pipe):
+    day = _day()
+    pipe.incr(bans_key(day))
+    pipe.expire(bans_key(day), DAY_TTL)
+
+
+def track_faq(pipe, answered: bool):
+    day = _day()
+    pipe.hincrby(faq_key(day), "answered" if answered else "forwarded", 1)
+    pipe.expire(faq_key(day), DAY_TTL)
+
+
+# ——— Чтение: один round trip ————————————————————————————————————
+async def read_stats(redis) -> dict:
+    day, month = _day(), _month()
+    pipe = redis.pipeline(transaction=False)
+    pipe.pfcount(users_day_key(day))
+    pipe.pfcount(users_month_key(month))
+    pipe.hgetall(messages_key(day))
+    pipe.hgetall(replies_key(day))
+    pipe.get(bans_key(day))
+    pipe.hgetall(faq_key(day))
+    # накопленные ответы пишутся в хвост того же pipeline и учитываются здесь же
+    pending = _pending_replies["count"], _pending_replies["total"]
+    results = await execute(pipe)
+    users_day, users_month, messages, replies, bans, faq = results[:6]
+
+    answered, forwarded = int(faq.get("answered", 0)), int(faq.get("forwarded", 0))
+    count = int(replies.get("count", 0)) + pending[0]
+    total = float(replies.get("total", 0)) + pending[1]
+    return {
+        "users_day": users_day,
+        "users_month": users_month,
+        "messages": {k: int(v) for k, v in messages.items()},
+        "replies": count,
+        "reply_latency": total / count if count else None,
+        "bans": int(bans or 0),
+        "faq_answered": answered,
+        "faq_rate": answered / (answered + forwarded) if answered + forwarded else None,
+    }
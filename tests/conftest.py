@@ -0,0 +1,177 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("BOT_TOKEN", "42:TEST")
+os.environ.setdefault("ADMIN_CHAT_ID", "-100")
+os.environ.setdefault("ADMIN_CHAT_IDS", "[-200]")
+os.environ.setdefault("START_MESSAGE", "start")
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import ForwardMessage, SendMessage
+from aiogram.types import Chat, Message, Update
+
+from bot.main import register_commands
+from bot.services.redis_client import RedisClient
+
+PRIMARY_CHAT = -100
+SECONDARY_CHAT = -200
+
+
+class FakeBot(Bot):
+    """Записывает вызовы API вместо отправки в Telegram."""
+
+    def __init__(self):
+        super().__init__(token=os.environ["BOT_TOKEN"])
+        self.calls = []
+
+    async def __call__(self, method, request_timeout=None):
+        self.calls.append(method)
+        if isinstance(method, (ForwardMessage, SendMessage)):
+            return Message(message_id=1000 + len(self.calls), date=0, chat=Chat(id=method.chat_id, type="supergroup"))
+
+
+class FakeRedis:
+    """Минимальный Redis в памяти: строки, множества, хеши и списки."""
+
+    def __init__(self):
+        self.data: dict = {}
+        self.fail: Exception | None = None  # выбрасывается из pipeline.execute()
+        self.executed = 0
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    def __getattr__(self, name):
+        op = getattr(self, f"_{name}")
+
+        async def call(*args, **kwargs):
+            return op(*args, **kwargs)
+        return call
+
+    def _get(self, key):
+        return self.data.get(key)
+
+    def _set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def _delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def _expire(self, key, ttl):
+        return key in self.data
+
+    def _incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def _sadd(self, key, *members):
+        target = self.data.setdefault(key, set())
+        before = len(target)
+        target.update(str(m) for m in members)
+        return len(target) - before
+
+    _pfadd = _sadd
+
+    def _pfcount(self, key):
+        return len(self.data.get(key, ()))
+
+    def _sismember(self, key, member):
+        return str(member) in self.data.get(key, ())
+
+    def _smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def _sscan(self, key, cursor=0, count=10):
+        members = sorted(self.data.get(key, ()))
+        chunk = members[cursor:cursor + count]
+        nxt = cursor + count
+        return (0 if nxt >= len(members) else nxt), chunk
+
+    def _hget(self, key, field):
+        return self.data.get(key, {}).get(str(field))
+
+    def _hset(self, key, field=None, value=None, mapping=None):
+        target = self.data.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        target.update({str(k): str(v) for k, v in items.items()})
+        return len(items)
+
+    def _hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def _hincrby(self, key, field, amount=1):
+        target = self.data.setdefault(key, {})
+        target[field] = str(int(target.get(field, 0)) + amount)
+        return int(target[field])
+
+    def _hincrbyfloat(self, key, field, amount=1.0):
+        target = self.data.setdefault(key, {})
+        target[field] = str(float(target.get(field, 0)) + amount)
+        return float(target[field])
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: list = []
+
+    def __getattr__(self, name):
+        op = getattr(self.redis, f"_{name}")
+
+        def queue(*args, **kwargs):
+            self.commands.append((op, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        if self.redis.fail:
+            raise self.redis.fail
+        self.redis.executed += 1
+        return [op(*args, **kwargs) for op, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def bot():
+    return FakeBot()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(RedisClient, "_client", fake)
+    return fake
+
+
+@pytest.fixture(scope="session")
+def dp():
+    # роутеры модулей глобальные и подключаются к диспетчеру только один раз
+    dispatcher = Dispatcher()
+    register_commands(dispatcher)
+    return dispatcher
+
+
+def make_update(chat_id: int, text: str, reply_to: dict | None = None, update_id: int = 1, from_id: int = 7) -> Update:
+    message = {
+        "message_id": 10,
+        "date": 0,
+        "chat": {"id": chat_id, "type": "supergroup" if chat_id < 0 else "private"},
+        "from": {"id": from_id, "is_bot": False, "first_name": "User"},
+        "text": text,
+    }
+    if reply_to:
+        message["reply_to_message"] = reply_to
+    return Update.model_validate({"update_id": update_id, "message": message})
+
+
+def feed(dp, bot, update: Update):
+    asyncio.run(dp.feed_update(bot, update))
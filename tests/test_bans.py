@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+
+from bot.commands.bans import apply_bans, parse_bans, render_bans
+from bot.commands.forward import BANNED_SET, banned_key
+from tests.conftest import FakeRedis
+
+
+def apply(redis, entries) -> list[int]:
+    async def run():
+        return [done async for done in apply_bans(redis, entries)]
+    return asyncio.run(run())
+
+
+def test_parse_csv_with_bom_and_bad_rows():
+    raw = "\ufeffuser_id,username,reason\n1,@a,spam\nabc,@b,x\n2,,\n".encode("utf-8")
+
+    entries, skipped = parse_bans(raw, "bans.csv")
+
+    assert entries == [
+        {"user_id": 1, "username": "@a", "reason": "spam"},
+        {"user_id": 2, "username": "", "reason": ""},
+    ]
+    assert skipped == 1
+
+
+def test_parse_json_detected_by_content():
+    raw = '[{"user_id": 3, "reason": "флуд"}, {"user_id": "4"}, 5, {"username": "x"}]'.encode()
+
+    entries, skipped = parse_bans(raw, "upload.txt")
+
+    assert [e["user_id"] for e in entries] == [3, 4]
+    assert entries[0] == {"user_id": 3, "username": "", "reason": "флуд"}
+    assert skipped == 2
+
+
+def test_parse_json_object_is_rejected():
+    with pytest.raises(ValueError):
+        parse_bans(b'{"user_id": 1}', "bans.json")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_export_import_round_trip_is_lossless(fmt):
+    source = FakeRedis()
+    source.data[BANNED_SET] = {"1", "2", "3"}
+    source.data[banned_key(1)] = {"username": "@a", "reason": "спам, реклама"}
+    source.data[banned_key(2)] = {"reason": "флуд"}  # без username
+
+    data, count = asyncio.run(render_bans(source, fmt))
+    entries, skipped = parse_bans(data, f"bans.{fmt}")
+    target = FakeRedis()
+    apply(target, entries)
+
+    assert (count, skipped) == (3, 0)
+    assert target.data == source.data
+
+
+def test_import_100k_entries_in_chunks():
+    entries = [{"user_id": i, "username": f"@u{i}", "reason": "spam"} for i in range(100_000)]
+    redis = FakeRedis()
+
+    started = time.monotonic()
+    progress = apply(redis, entries)
+
+    assert progress[-1] == 100_000
+    assert redis.executed == len(progress) == 20
+    assert len(redis.data[BANNED_SET]) == 100_000
+    assert time.monotonic() - started < 5
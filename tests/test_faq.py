@@ -0,0 +1,39 @@
+import os
+
+from bot.services import faq
+from bot.services.faq import FaqMatcher
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "faq.example.json")
+
+
+def test_disabled_without_faq_path():
+    faq.load_faq()
+
+    assert faq.match("Как оплатить заказ?") is None
+
+
+def test_example_matches_and_keeps_previous_on_bad_reload(monkeypatch):
+    monkeypatch.setattr(faq, "_matcher", None)
+    with open(EXAMPLE, encoding="utf-8") as f:
+        faq.load_faq(f.read())
+
+    assert faq.match("ОПЛАТА!!!") is not None
+    assert faq.match("оплата, позовите оператора") is None
+
+    monkeypatch.setattr(faq.settings, "faq_path", "/nonexistent/faq.json")
+    faq.load_faq()
+    faq.load_faq("{not json")
+
+    assert faq.match("Как оплатить заказ?") is not None
+
+
+def test_phrases_without_words_are_ignored():
+    matcher = FaqMatcher(
+        [{"keywords": ["?", "!!", "", "доставка"], "answer": "SHIP"}],
+        human_phrases=["", "оператор"],
+    )
+
+    assert matcher.match("привет") is None
+    assert matcher.match("где мой заказ") is None
+    assert matcher.match("Доставка?") == "SHIP"
+    assert matcher.match("доставка, нужен оператор") is None
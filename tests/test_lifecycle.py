@@ -0,0 +1,53 @@
+import asyncio
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from bot.services.lifecycle import LeaderLock
+from bot.services.redis_client import RedisClient
+
+
+class FailingRedis:
+    def __init__(self, failures: int | None):
+        self.failures = failures  # None — падать всегда
+        self.calls = 0
+
+    async def eval(self, *args):
+        self.calls += 1
+        if self.failures is None or self.calls <= self.failures:
+            raise RedisConnectionError("redis down")
+        return 1
+
+
+def run_keep_alive(monkeypatch, redis, ttl: float, duration: float):
+    monkeypatch.setattr(RedisClient, "_client", redis)
+    lock = LeaderLock(ttl=ttl)
+    lost = []
+
+    async def on_lost():
+        lost.append(True)
+
+    async def scenario():
+        task = asyncio.create_task(lock.keep_alive(on_lost))
+        try:
+            await asyncio.wait_for(asyncio.shield(task), duration)
+        except asyncio.TimeoutError:
+            task.cancel()
+
+    asyncio.run(scenario())
+    return lock, lost
+
+
+def test_renewal_errors_past_ttl_mark_lock_lost(monkeypatch):
+    lock, lost = run_keep_alive(monkeypatch, FailingRedis(failures=None), ttl=0.06, duration=0.5)
+
+    assert lock.lost is True
+    assert lost == [True]
+
+
+def test_single_renewal_error_is_retried(monkeypatch):
+    redis = FailingRedis(failures=1)
+    lock, lost = run_keep_alive(monkeypatch, redis, ttl=0.3, duration=0.4)
+
+    assert lock.lost is False
+    assert lost == []
+    assert redis.calls >= 2
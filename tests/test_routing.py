@@ -0,0 +1,50 @@
+import pytest
+
+from bot.commands import stats as stats_module
+from tests.conftest import PRIMARY_CHAT, SECONDARY_CHAT, feed, make_update
+
+STATS = {
+    "users_day": 1, "users_month": 1, "messages": {}, "replies": 0,
+    "reply_latency": None, "bans": 0, "faq_answered": 0, "faq_rate": None,
+}
+
+
+@pytest.fixture
+def read_stats(monkeypatch):
+    calls = []
+
+    async def fake_read_stats(redis):
+        calls.append(redis)
+        return STATS
+
+    monkeypatch.setattr(stats_module, "read_stats", fake_read_stats)
+    return calls
+
+
+@pytest.mark.parametrize("chat_id", [PRIMARY_CHAT, SECONDARY_CHAT])
+def test_stats_from_any_admin_chat(dp, bot, read_stats, chat_id):
+    feed(dp, bot, make_update(chat_id, "/stats"))
+
+    assert len(read_stats) == 1
+    assert [type(c).__name__ for c in bot.calls] == ["SendMessage"]
+    assert bot.calls[0].chat_id == chat_id
+
+
+def test_secondary_chat_chatter_is_not_forwarded(dp, bot):
+    feed(dp, bot, make_update(SECONDARY_CHAT, "обычное сообщение админов"))
+
+    assert bot.calls == []
+
+
+def test_stats_as_reply_is_not_sent_to_user(dp, bot, read_stats):
+    forwarded = {
+        "message_id": 5,
+        "date": 0,
+        "chat": {"id": SECONDARY_CHAT, "type": "supergroup"},
+        "forward_from": {"id": 42, "is_bot": False, "first_name": "User"},
+        "text": "вопрос",
+    }
+    feed(dp, bot, make_update(SECONDARY_CHAT, "/stats", reply_to=forwarded))
+
+    assert len(read_stats) == 1
+    assert [c.chat_id for c in bot.calls] == [SECONDARY_CHAT]
@@ -0,0 +1,115 @@
+import asyncio
+
+from aiogram.types import Chat, Update
+
+from bot.services.scheduler import PRIORITY_USER, UpdateScheduler
+from tests.conftest import PRIMARY_CHAT
+
+ADMIN = {"event_chat": Chat(id=PRIMARY_CHAT, type="supergroup")}
+USER = {"event_chat": Chat(id=42, type="private")}
+
+
+class Blocking:
+    """Хендлер, который держит слот до release.set()."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.handled = []
+
+    async def __call__(self, event, data):
+        self.handled.append(event.update_id)
+        await self.release.wait()
+
+
+async def start(scheduler, handler, update_id, data):
+    task = asyncio.create_task(scheduler(handler, Update(update_id=update_id), data))
+    await asyncio.sleep(0)
+    return task
+
+
+def test_admin_update_gets_freed_slot_before_earlier_user_update():
+    async def scenario():
+        scheduler = UpdateScheduler(max_in_flight=1, user_queue_limit=10, user_max_wait=10)
+        handler = Blocking()
+        tasks = [
+            await start(scheduler, handler, 1, USER),
+            await start(scheduler, handler, 2, USER),
+            await start(scheduler, handler, 3, ADMIN),
+        ]
+        handler.release.set()
+        await asyncio.gather(*tasks)
+        return handler.handled
+
+    assert asyncio.run(scenario()) == [1, 3, 2]
+
+
+def test_user_update_shed_when_queue_is_full():
+    async def scenario():
+        scheduler = UpdateScheduler(max_in_flight=1, user_queue_limit=1, user_max_wait=10)
+        handler = Blocking()
+        tasks = [await start(scheduler, handler, i, USER) for i in (1, 2, 3)]
+        await tasks[2]  # третий отбрасывается сразу, не дожидаясь слота
+        handler.release.set()
+        await asyncio.gather(*tasks)
+        return handler.handled, scheduler.stats[PRIORITY_USER].shed
+
+    assert asyncio.run(scenario()) == ([1, 2], 1)
+
+
+def test_user_update_shed_after_max_wait():
+    async def scenario():
+        scheduler = UpdateScheduler(max_in_flight=1, user_queue_limit=10, user_max_wait=0.01)
+        handler = Blocking()
+        tasks = [await start(scheduler, handler, i, USER) for i in (1, 2)]
+        await tasks[1]
+        handler.release.set()
+        await asyncio.gather(*tasks)
+        return handler.handled, scheduler.stats[PRIORITY_USER].shed
+
+    assert asyncio.run(scenario()) == ([1], 1)
+
+
+def test_drain_returns_only_updates_that_never_started():
+    async def scenario():
+        scheduler = UpdateScheduler(max_in_flight=1, user_queue_limit=10, user_max_wait=10)
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(event, data):
+            handled.append(event.update_id)
+            await release.wait()
+
+        running = Update(update_id=1)
+        waiting = Update(update_id=2)
+        tasks = [asyncio.create_task(scheduler(handler, u, {})) for u in (running, waiting)]
+        await asyncio.sleep(0)
+
+        leftovers = await scheduler.drain(timeout=0.01)
+        release.set()
+        await asyncio.gather(*tasks)
+        return leftovers, handled
+
+    leftovers, handled = asyncio.run(scenario())
+
+    assert [u.update_id for u in leftovers] == [2]
+    assert handled == [1]
+
+
+def test_update_handed_a_slot_is_not_persisted():
+    async def scenario():
+        scheduler = UpdateScheduler(max_in_flight=1, user_queue_limit=10, user_max_wait=10)
+        handler = Blocking()
+        tasks = [await start(scheduler, handler, i, USER) for i in (1, 2)]
+
+        # слот передан второму апдейту, но тот ещё не возобновился
+        scheduler._release()
+        leftovers = scheduler._close()
+
+        handler.release.set()
+        await asyncio.gather(*tasks)
+        return leftovers, handler.handled
+
+    leftovers, handled = asyncio.run(scenario())
+
+    assert leftovers == []
+    assert handled == [1, 2]
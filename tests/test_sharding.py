@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from bot.services import sharding
+from bot.services.sharding import ASSIGNMENT_HASH, HashRing, get_admin_chat
+from tests.conftest import PRIMARY_CHAT, SECONDARY_CHAT, feed, make_update
+
+USER = 42
+
+
+def test_ring_moves_only_users_of_removed_chat():
+    full = HashRing([-1, -2, -3])
+    reduced = HashRing([-1, -3])
+    users = range(2000)
+
+    assert {full.get_node(u) for u in users} == {-1, -2, -3}
+    assert all(reduced.get_node(u) == full.get_node(u) for u in users if full.get_node(u) != -2)
+
+
+def test_assignment_is_sticky(redis, monkeypatch):
+    first = asyncio.run(get_admin_chat(USER))
+    assert redis.data[ASSIGNMENT_HASH][str(USER)] == str(first)
+
+    other = SECONDARY_CHAT if first == PRIMARY_CHAT else PRIMARY_CHAT
+    monkeypatch.setattr(sharding, "_ring", HashRing([other]))
+
+    assert asyncio.run(get_admin_chat(USER)) == first
+
+
+def test_removed_chat_is_reassigned(redis):
+    redis.data[ASSIGNMENT_HASH] = {str(USER): "-300"}
+
+    chat_id = asyncio.run(get_admin_chat(USER))
+
+    assert chat_id in (PRIMARY_CHAT, SECONDARY_CHAT)
+    assert redis.data[ASSIGNMENT_HASH][str(USER)] == str(chat_id)
+
+
+@pytest.mark.parametrize("stored_chat, expected_reply", [(PRIMARY_CHAT, 77), (SECONDARY_CHAT, None)])
+def test_reply_id_dropped_when_chat_changed(dp, bot, redis, stored_chat, expected_reply):
+    redis.data[ASSIGNMENT_HASH] = {str(USER): str(PRIMARY_CHAT)}
+    redis.data["reply_map:5"] = f"{stored_chat}:77"
+    reply_to = {"message_id": 5, "date": 0, "chat": {"id": USER, "type": "private"}, "text": "ответ админа"}
+
+    feed(dp, bot, make_update(USER, "уточнение", reply_to=reply_to, from_id=USER))
+
+    forward = bot.calls[0]
+    assert forward.chat_id == PRIMARY_CHAT
+    assert forward.reply_to_message_id == expected_reply
+    assert forward.allow_sending_without_reply is True
+    assert redis.data["reply_map:10"] == f"{PRIMARY_CHAT}:{1000 + len(bot.calls)}"
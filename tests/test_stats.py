@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from bot.services import stats
+from bot.services.stats import messages_key, read_stats, replies_key, track_message, track_reply
+
+
+@pytest.fixture(autouse=True)
+def pending(monkeypatch):
+    buffer = {"count": 0, "total": 0.0}
+    monkeypatch.setattr(stats, "_pending_replies", buffer)
+    return buffer
+
+
+def forward(redis, user_id: int, kind: str = "text"):
+    pipe = redis.pipeline(transaction=False)
+    pipe.set("reply_map:1", "x")
+    track_message(pipe, user_id, kind)
+    return asyncio.run(stats.execute(pipe))
+
+
+def test_replies_ride_along_with_forward_pipeline(redis, pending):
+    track_reply(30)
+    track_reply(90)
+
+    forward(redis, 1)
+
+    day = stats._day()
+    assert redis.executed == 1
+    assert redis.data[replies_key(day)] == {"count": "2", "total": "120.0"}
+    assert redis.data[messages_key(day)] == {"text": "1"}
+    assert pending == {"count": 0, "total": 0.0}
+
+
+def test_failed_execute_keeps_buffered_replies(redis, pending):
+    track_reply(30)
+    redis.fail = ConnectionError("redis down")
+
+    with pytest.raises(ConnectionError):
+        forward(redis, 1)
+
+    assert pending == {"count": 1, "total": 30.0}
+
+
+@pytest.mark.parametrize("buffered", [0, 3])
+def test_read_stats_with_and_without_buffered_replies(redis, pending, buffered):
+    forward(redis, 1, "photo")
+    forward(redis, 2, "photo")
+    for _ in range(buffered):
+        track_reply(60)
+
+    result = asyncio.run(read_stats(redis))
+
+    assert result["users_day"] == 2
+    assert result["users_month"] == 2
+    assert result["messages"] == {"photo": 2}
+    assert result["replies"] == buffered
+    assert result["reply_latency"] == (60 if buffered else None)
+    assert result["bans"] == 0
+    assert pending["count"] == 0
+    assert redis.data.get(replies_key(stats._day()), {}).get("count") == (str(buffered) if buffered else None)